@@ -37,6 +37,15 @@ class FreelanceEscrow {
     return status;
   }
 
+  async getStatusBundle() {
+    const bundle = await this.client.readContract({
+      address: this.contractAddress,
+      functionName: "get_status_bundle",
+      args: [],
+    });
+    return bundle;
+  }
+
   async getEvaluation() {
     const evaluation = await this.client.readContract({
       address: this.contractAddress,
@@ -107,6 +116,25 @@ class FreelanceEscrow {
     return receipt;
   }
 
+  // Full evaluator reasoning from an evaluate_and_release receipt.
+  // Only a verdict + hash is kept on-chain, so this is the one place the
+  // text is available. Returns "" if the receipt carries no evaluation.
+  extractEvaluation(receipt) {
+    let leader = receipt?.consensus_data?.leader_receipt;
+    if (Array.isArray(leader)) leader = leader[0];
+    let result = leader?.result;
+    if (result?.payload?.readable !== undefined) result = result.payload.readable;
+    if (typeof result === "string") {
+      try {
+        result = JSON.parse(result);
+      } catch {
+        return "";
+      }
+    }
+    if (result instanceof Map) result = Object.fromEntries(result);
+    return typeof result?.evaluation === "string" ? result.evaluation : "";
+  }
+
   async cancelJob() {
     const txHash = await this.client.writeContract({
       address: this.contractAddress,
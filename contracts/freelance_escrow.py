@@ -10,7 +10,162 @@
 # Test with:   genlayer test
 
 from genlayer import *
+import asyncio
+import hashlib
 import json
+import re
+from enum import IntEnum
+
+
+# Input length limits; these bound every evaluation prompt
+_MAX_TITLE = 256
+_MAX_REQS = 8192
+_MAX_URL = 2048
+
+# Max deliverable URLs per submission; fits in one concurrent fetch wave
+_MAX_URLS = 5
+
+# Rough chars-per-token ratio used to budget the submission preview
+_CHARS_PER_TOKEN = 4
+
+# Token budget for all submission previews combined
+_PREVIEW_TOKENS = 1500
+
+# Max deliverable URLs fetched at the same time
+_FETCH_CONCURRENCY = 5
+
+# Placeholder content for a deliverable URL that could not be fetched
+_UNAVAILABLE = "UNAVAILABLE"
+
+
+class Status(IntEnum):
+    """Job lifecycle, stored on-chain as a small int."""
+    OPEN = 0
+    IN_PROGRESS = 1
+    SUBMITTED = 2
+    COMPLETED = 3
+    REFUNDED = 4
+
+
+# Public status names, indexed by Status (kept for ABI compatibility)
+_STATUS_NAMES = ("open", "in_progress", "submitted", "completed", "refunded")
+
+# Settled job statuses; the deadline no longer matters once reached
+_TERMINAL = frozenset((Status.COMPLETED, Status.REFUNDED))
+
+# Statuses from which the client can reclaim funds after the deadline
+_REFUNDABLE = frozenset((Status.OPEN, Status.IN_PROGRESS))
+
+# Pages with less text than this are treated as empty
+_MIN_CONTENT = 100
+
+# Only pages shorter than this are checked for error signatures, so a
+# real deliverable that merely mentions "404" isn't thrown out
+_ERROR_PAGE_MAX = 2000
+
+# Common HTTP error page signatures
+_ERROR_PAGE_RE = re.compile(
+    r"404 Not Found|403 Forbidden|Page not found|500 Internal Server Error"
+    r"|502 Bad Gateway|503 Service Unavailable",
+    re.IGNORECASE
+)
+
+# Runs of whitespace, collapsed to one space in submission previews
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# Decorative separator runs (----, ====, ****, ...), squashed to three
+# chars; the narrow class and 4+ length leave code operators intact
+_SEPARATOR_RE = re.compile(r"([-=_*#~.])\1{3,}")
+
+# Matches the "VERDICT: APPROVED|REJECTED" line of the LLM response
+_VERDICT_RE = re.compile(r"VERDICT\s*:\s*(APPROVED|REJECTED)", re.IGNORECASE)
+
+
+# ============================================
+# EVALUATION PROMPT TEMPLATES
+# ============================================
+# The prefix only holds fields fixed at construction; everything that
+# depends on the fetched submission lives in the suffix.
+
+_PROMPT_PREFIX_TMPL = """You are an impartial evaluator for a freelance job submission.
+
+## JOB DETAILS
+
+**Title:** {title}
+
+**Requirements:**
+{requirements}
+
+"""
+
+_SUBMISSION_TMPL = """**URL:** {url}
+
+**Content Preview:**
+{preview}
+"""
+
+_PROMPT_SUFFIX_TMPL = """## SUBMISSION
+
+{submissions}
+
+## YOUR TASK
+
+Evaluate whether this submission meets the stated requirements.
+
+Consider:
+1. Does it address ALL stated requirements?
+2. Is the implementation functional and reasonable?
+3. Are there critical missing pieces that would make it unusable?
+
+Be fair but strict. The freelancer was paid to deliver what was asked.
+
+## REQUIRED RESPONSE FORMAT
+
+You MUST respond in exactly this format:
+
+VERDICT: [APPROVED or REJECTED]
+CONFIDENCE: [HIGH, MEDIUM, or LOW]
+SUMMARY: [One sentence summary of your decision]
+DETAILS: [2-3 sentences explaining your reasoning]
+
+Example:
+VERDICT: APPROVED
+CONFIDENCE: HIGH
+SUMMARY: The submission meets all stated requirements.
+DETAILS: The code includes user authentication, analytics charts, and responsive design as requested. Dark mode is implemented via a toggle in the header. Code quality is acceptable.
+"""
+
+# The suffix has a single placeholder, so split it once at import and
+# concatenate per evaluation instead of re-parsing it with format()
+_PROMPT_SUFFIX_HEAD, _, _PROMPT_SUFFIX_TAIL = _PROMPT_SUFFIX_TMPL.partition("{submissions}")
+
+
+def _preview(text: str, max_chars: int) -> str:
+    """First max_chars characters of fetched text, so large pages are never scanned in full."""
+    return text[:max_chars]
+
+
+def _is_unusable_page(text: str) -> bool:
+    """True if fetched text is empty or looks like an HTTP error page."""
+    # Anything longer than the window is neither empty nor a short error page
+    stripped = _preview(text, _ERROR_PAGE_MAX * 4).strip()
+    if len(stripped) < _MIN_CONTENT:
+        return True
+    return len(stripped) < _ERROR_PAGE_MAX and _ERROR_PAGE_RE.search(stripped) is not None
+
+
+def _compact(text: str, max_tokens: int = _PREVIEW_TOKENS) -> str:
+    """
+    Shrinks fetched page text before it goes into the prompt:
+    collapses whitespace, shortens decorative separators (----, ====, ...)
+    and truncates to an approximate token budget.
+    """
+    budget = max_tokens * _CHARS_PER_TOKEN
+    # Pre-slice with headroom so huge pages don't get regex-scanned in full
+    text = _preview(text, budget * 4)
+    text = _WHITESPACE_RE.sub(" ", text)
+    text = _SEPARATOR_RE.sub(r"\1\1\1", text)
+    return text[:budget].strip()
 
 
 @gl.contract
@@ -25,11 +180,17 @@ class FreelanceEscrow:
     3. Freelancer submits work URL via submit_work()
     4. Anyone calls evaluate_and_release() to trigger AI evaluation
     5. Payment auto-releases to freelancer (approved) or refunds to client (rejected)
+    
+    Limits: job title <= 256 chars, requirements <= 8192 chars,
+    at most 5 submission URLs of <= 2048 chars each.
     """
     
     # ============================================
     # STATE VARIABLES
     # ============================================
+    # @gl.contract turns these annotations into storage-backed fields,
+    # so instances carry no per-field __dict__ entries; don't add
+    # __slots__ here, it would shadow the generated storage accessors.
     
     # Job details
     client: Address           # Who posted the job
@@ -37,15 +198,17 @@ class FreelanceEscrow:
     job_title: str            # Human-readable title
     requirements: str         # Detailed requirements for AI to evaluate against
     payment_amount: u256      # Locked funds (in wei)
-    submission_url: str       # Freelancer's deliverable URL
+    submission_url: str       # Freelancer's deliverable URL (first one if several)
+    submission_urls: DynArray[str]  # All deliverable URLs (repo, demo, docs, ...)
     
     # Status tracking
-    # Possible values: "open", "in_progress", "submitted", "completed", "refunded"
-    status: str
+    # A Status value; exposed to callers via _STATUS_NAMES
+    status: u8
     created_at: u256          # Block timestamp when created
     deadline: u256            # Unix timestamp - deadline for submission
+    submitted_at: u256        # Block timestamp of the work submission
     
-    # Evaluation result (stored for transparency)
+    # Evaluation record, see get_evaluation() for its two formats
     evaluation_result: str
     
     # ============================================
@@ -70,7 +233,9 @@ class FreelanceEscrow:
         """
         # Validate inputs
         assert len(job_title) > 0, "Job title required"
+        assert len(job_title) <= _MAX_TITLE, "Job title too long"
         assert len(requirements) > 0, "Requirements required"
+        assert len(requirements) <= _MAX_REQS, "Requirements too long"
         assert deadline_hours > 0, "Deadline must be in the future"
         assert gl.message.value > 0, "Must include payment"
         
@@ -87,9 +252,10 @@ class FreelanceEscrow:
         self.submission_url = ""
         
         # Set status and timestamps
-        self.status = "open"
-        self.created_at = gl.block.timestamp
-        self.deadline = gl.block.timestamp + (deadline_hours * 3600)
+        self.status = Status.OPEN
+        now = gl.block.timestamp
+        self.created_at = now
+        self.deadline = now + (deadline_hours * 3600)
         
         # Initialize evaluation result
         self.evaluation_result = ""
@@ -108,11 +274,11 @@ class FreelanceEscrow:
         - Caller cannot be the client (no self-dealing)
         - Only one freelancer can accept
         """
-        assert self.status == "open", "Job not available"
+        assert self.status == Status.OPEN, "Job not available"
         assert gl.message.sender != self.client, "Client cannot accept own job"
         
         self.freelancer = gl.message.sender
-        self.status = "in_progress"
+        self.status = Status.IN_PROGRESS
     
     @gl.public.write
     def submit_work(self, url: str):
@@ -125,16 +291,44 @@ class FreelanceEscrow:
         Constraints:
         - Job must be in "in_progress" status
         - Only the assigned freelancer can submit
-        - URL cannot be empty
+        - URL must be non-empty and at most 2048 chars
         
         Pro tip: For best results, use stable URLs (GitHub commits, IPFS, etc.)
         """
-        assert self.status == "in_progress", "Job not in progress"
+        assert self.status == Status.IN_PROGRESS, "Job not in progress"
         assert gl.message.sender == self.freelancer, "Only assigned freelancer can submit"
         assert len(url) > 0, "URL cannot be empty"
+        assert len(url) <= _MAX_URL, "URL too long"
         
         self.submission_url = url
-        self.status = "submitted"
+        self.submission_urls = [url]
+        self.submitted_at = gl.block.timestamp
+        self.status = Status.SUBMITTED
+    
+    @gl.public.write
+    def submit_work_multi(self, urls: list[str]):
+        """
+        Freelancer submits several deliverables at once.
+        
+        Args:
+            urls: URLs to the deliverables (e.g. repo + live demo + docs)
+        
+        Same constraints as submit_work(), plus at most 5 distinct URLs.
+        All URLs are fetched concurrently during evaluation.
+        """
+        assert self.status == Status.IN_PROGRESS, "Job not in progress"
+        assert gl.message.sender == self.freelancer, "Only assigned freelancer can submit"
+        assert len(urls) > 0, "At least one URL required"
+        assert len(urls) <= _MAX_URLS, "Too many URLs"
+        assert len(set(urls)) == len(urls), "Duplicate URLs"
+        for url in urls:
+            assert len(url) > 0, "URL cannot be empty"
+            assert len(url) <= _MAX_URL, "URL too long"
+        
+        self.submission_url = urls[0]
+        self.submission_urls = list(urls)
+        self.submitted_at = gl.block.timestamp
+        self.status = Status.SUBMITTED
     
     # ============================================
     # THE MAGIC: AI-POWERED EVALUATION
@@ -161,9 +355,17 @@ class FreelanceEscrow:
         identical responses - just the same APPROVED/REJECTED verdict.
         
         Returns:
-            dict with verdict and full evaluation text
+            dict with verdict, full evaluation text and its SHA-256 hash
         """
-        assert self.status == "submitted", "No submission to evaluate"
+        assert self.status == Status.SUBMITTED, "No submission to evaluate"
+        
+        # Work submitted after the deadline is refunded outright, without
+        # spending a web fetch and an LLM call on every validator
+        if self.submitted_at > self.deadline:
+            self.evaluation_result = "REJECTED: Submitted after deadline"
+            self.status = Status.REFUNDED
+            gl.transfer(self.client, self.payment_amount)
+            return {"verdict": "REJECTED", "reason": "deadline"}
         
         # ----------------------------------------
         # Step 1: Fetch the submission content
@@ -171,65 +373,59 @@ class FreelanceEscrow:
         # GenLayer can natively access the web - no oracles needed!
         # Each validator fetches independently for trustlessness.
         
-        try:
-            submission_content = await gl.get_webpage(
-                self.submission_url,
-                mode="text"
-            )
-        except Exception as e:
-            # If we can't fetch the URL, that's a rejection
-            self.evaluation_result = f"REJECTED: Could not access submission URL. Error: {str(e)}"
+        # All deliverables are fetched concurrently; a URL that fails
+        # is marked UNAVAILABLE instead of aborting the whole evaluation.
+        
+        urls = list(self.submission_urls)
+        sem = asyncio.Semaphore(_FETCH_CONCURRENCY)
+        
+        async def fetch(url: str) -> str:
+            async with sem:
+                return await gl.get_webpage(url, mode="text")
+        
+        fetched = await asyncio.gather(
+            *(fetch(url) for url in urls),
+            return_exceptions=True
+        )
+        
+        errors = [r for r in fetched if isinstance(r, BaseException)]
+        if len(errors) == len(urls):
+            # If we can't fetch anything, that's a rejection
+            self.evaluation_result = f"REJECTED: Could not access submission URL. Error: {str(errors[0])}"
+            self.status = Status.REFUNDED
             gl.transfer(self.client, self.payment_amount)
-            self.status = "refunded"
             return {"verdict": "REJECTED", "reason": "URL inaccessible"}
         
+        # Empty pages and error pages can't meet any requirement, so
+        # treat them like failed fetches and skip the LLM if nothing
+        # usable is left.
+        fetched = [
+            None if isinstance(content, BaseException) or _is_unusable_page(content) else content
+            for content in fetched
+        ]
+        if all(content is None for content in fetched):
+            self.evaluation_result = "REJECTED: Submission is empty or an error page"
+            self.status = Status.REFUNDED
+            gl.transfer(self.client, self.payment_amount)
+            return {"verdict": "REJECTED", "reason": "empty"}
+        
         # ----------------------------------------
         # Step 2: Build the evaluation prompt
         # ----------------------------------------
-        # Structured prompt for consistent, parseable output
-        
-        evaluation_prompt = f"""You are an impartial evaluator for a freelance job submission.
-
-## JOB DETAILS
-
-**Title:** {self.job_title}
-
-**Requirements:**
-{self.requirements}
-
-## SUBMISSION
-
-**URL:** {self.submission_url}
-
-**Content Preview:**
-{submission_content[:4000]}
-
-## YOUR TASK
-
-Evaluate whether this submission meets the stated requirements.
-
-Consider:
-1. Does it address ALL stated requirements?
-2. Is the implementation functional and reasonable?
-3. Are there critical missing pieces that would make it unusable?
-
-Be fair but strict. The freelancer was paid to deliver what was asked.
-
-## REQUIRED RESPONSE FORMAT
-
-You MUST respond in exactly this format:
-
-VERDICT: [APPROVED or REJECTED]
-CONFIDENCE: [HIGH, MEDIUM, or LOW]
-SUMMARY: [One sentence summary of your decision]
-DETAILS: [2-3 sentences explaining your reasoning]
-
-Example:
-VERDICT: APPROVED
-CONFIDENCE: HIGH
-SUMMARY: The submission meets all stated requirements.
-DETAILS: The code includes user authentication, analytics charts, and responsive design as requested. Dark mode is implemented via a toggle in the header. Code quality is acceptable.
-"""
+        # Structured prompt for consistent, parseable output.
+        # The job-specific prefix comes first and is byte-identical on
+        # every validator and every retry, so LLM backends with prefix
+        # caching can reuse its KV cache and only prefill the suffix.
+        
+        budget = _PREVIEW_TOKENS // len(urls)
+        submission_content = "\n".join(
+            _SUBMISSION_TMPL.format(
+                url=url,
+                preview=_UNAVAILABLE if content is None else _compact(content, budget)
+            )
+            for url, content in zip(urls, fetched)
+        )
+        evaluation_prompt = self._static_prefix() + self._dynamic_suffix(submission_content)
         
         # ----------------------------------------
         # Step 3: Call the LLM
@@ -242,18 +438,17 @@ DETAILS: The code includes user authentication, analytics charts, and responsive
         # ----------------------------------------
         # Step 4: Parse the verdict
         # ----------------------------------------
-        # We look for explicit VERDICT markers for reliability
-        
-        verdict = "REJECTED"  # Default to rejected (safer for client)
+        # We look for explicit VERDICT markers for reliability.
+        # No marker defaults to rejected (safer for client).
         
-        response_upper = ai_response.upper()
-        if "VERDICT: APPROVED" in response_upper or "VERDICT:APPROVED" in response_upper:
-            verdict = "APPROVED"
-        elif "VERDICT: REJECTED" in response_upper or "VERDICT:REJECTED" in response_upper:
-            verdict = "REJECTED"
+        match = _VERDICT_RE.search(ai_response)
+        verdict = match.group(1).upper() if match else "REJECTED"
         
-        # Store the full evaluation for transparency
-        self.evaluation_result = ai_response
+        # Only the verdict and a hash of the full evaluation go into
+        # storage; the full text is returned in the transaction result,
+        # where anyone can check it against the stored hash.
+        evaluation_hash = hashlib.sha256(ai_response.encode()).hexdigest()
+        self.evaluation_result = f"{verdict}:{evaluation_hash}"
         
         # ----------------------------------------
         # Step 5: Execute based on verdict
@@ -261,18 +456,37 @@ DETAILS: The code includes user authentication, analytics charts, and responsive
         
         if verdict == "APPROVED":
             # Success! Transfer payment to freelancer
+            self.status = Status.COMPLETED
             gl.transfer(self.freelancer, self.payment_amount)
-            self.status = "completed"
         else:
             # Rejected - refund to client
+            self.status = Status.REFUNDED
             gl.transfer(self.client, self.payment_amount)
-            self.status = "refunded"
         
         return {
             "verdict": verdict,
-            "evaluation": ai_response
+            "evaluation": ai_response,
+            "evaluation_hash": evaluation_hash
         }
     
+    # ============================================
+    # PROMPT CONSTRUCTION (internal)
+    # ============================================
+    
+    def _static_prefix(self) -> str:
+        """
+        Instructions + job details. Depends only on fields fixed at
+        construction, so it is identical across validators and retries.
+        """
+        return _PROMPT_PREFIX_TMPL.format(
+            title=self.job_title,
+            requirements=self.requirements
+        )
+    
+    def _dynamic_suffix(self, submission_content: str) -> str:
+        """Submission previews + task directives (varies per fetch)."""
+        return _PROMPT_SUFFIX_HEAD + submission_content + _PROMPT_SUFFIX_TAIL
+    
     # ============================================
     # SAFETY MECHANISMS
     # ============================================
@@ -284,11 +498,11 @@ DETAILS: The code includes user authentication, analytics charts, and responsive
         
         Full refund is issued to the client.
         """
-        assert self.status == "open", "Can only cancel open jobs"
+        assert self.status == Status.OPEN, "Can only cancel open jobs"
         assert gl.message.sender == self.client, "Only client can cancel"
         
+        self.status = Status.REFUNDED
         gl.transfer(self.client, self.payment_amount)
-        self.status = "refunded"
     
     @gl.public.write
     def claim_deadline_refund(self):
@@ -298,11 +512,11 @@ DETAILS: The code includes user authentication, analytics charts, and responsive
         This protects clients from freelancers who accept but never deliver.
         """
         assert gl.block.timestamp > self.deadline, "Deadline not yet passed"
-        assert self.status in ["open", "in_progress"], "Invalid status for deadline refund"
+        assert self.status in _REFUNDABLE, "Invalid status for deadline refund"
         assert gl.message.sender == self.client, "Only client can claim deadline refund"
         
+        self.status = Status.REFUNDED
         gl.transfer(self.client, self.payment_amount)
-        self.status = "refunded"
     
     @gl.public.write
     def withdraw_as_freelancer(self):
@@ -312,11 +526,11 @@ DETAILS: The code includes user authentication, analytics charts, and responsive
         Returns the job to "open" status so another freelancer can accept.
         No penalty - just good faith withdrawal.
         """
-        assert self.status == "in_progress", "Can only withdraw from in-progress jobs"
+        assert self.status == Status.IN_PROGRESS, "Can only withdraw from in-progress jobs"
         assert gl.message.sender == self.freelancer, "Only assigned freelancer can withdraw"
         
         self.freelancer = Address("")
-        self.status = "open"
+        self.status = Status.OPEN
     
     # ============================================
     # VIEW METHODS (Read-only, no gas)
@@ -325,14 +539,17 @@ DETAILS: The code includes user authentication, analytics charts, and responsive
     @gl.public.view
     def get_job_details(self) -> dict:
         """Returns all job information as a dictionary."""
+        # Not memoized: views can't write storage and each call runs on a
+        # fresh contract instance, so an in-memory cache would never hit.
         return {
             "title": self.job_title,
             "requirements": self.requirements,
             "payment": str(self.payment_amount),
             "client": str(self.client),
             "freelancer": str(self.freelancer),
-            "status": self.status,
+            "status": _STATUS_NAMES[self.status],
             "submission_url": self.submission_url,
+            "submission_urls": list(self.submission_urls),
             "deadline": str(self.deadline),
             "created_at": str(self.created_at),
             "evaluation_result": self.evaluation_result
@@ -341,21 +558,58 @@ DETAILS: The code includes user authentication, analytics charts, and responsive
     @gl.public.view
     def get_status(self) -> str:
         """Quick status check."""
-        return self.status
+        return _STATUS_NAMES[self.status]
+    
+    @gl.public.view
+    def get_status_bundle(self) -> dict:
+        """
+        Status, deadline, time remaining and deadline-passed flag in one
+        call. Preferred endpoint for frontends that poll job state.
+        """
+        status = self.status
+        if status in _TERMINAL:
+            remaining, passed = 0, False
+        else:
+            now = gl.block.timestamp
+            remaining = 0 if now >= self.deadline else self.deadline - now
+            passed = now > self.deadline
+        return {
+            "status": _STATUS_NAMES[status],
+            "deadline": str(self.deadline),
+            "time_remaining": remaining,
+            "deadline_passed": passed
+        }
     
     @gl.public.view
     def get_evaluation(self) -> str:
-        """Returns the AI evaluation result (if evaluated)."""
+        """
+        Returns the on-chain evaluation record ("" until evaluated).
+        
+        Formats:
+            "APPROVED:<sha256>" / "REJECTED:<sha256>" - the LLM ran;
+                <sha256> is the hex digest of its full response
+            "REJECTED: <reason>" (note the space) - refunded without an
+                LLM call (late, unreachable or empty submission)
+        
+        The full AI evaluation text is the "evaluation" field of the
+        evaluate_and_release transaction result; hash it to check it
+        against the stored digest.
+        """
         return self.evaluation_result
     
     @gl.public.view
     def is_deadline_passed(self) -> bool:
-        """Check if the deadline has passed."""
+        """Check if the deadline has passed (always False once settled)."""
+        if self.status in _TERMINAL:
+            return False
         return gl.block.timestamp > self.deadline
     
     @gl.public.view
     def time_remaining(self) -> u256:
-        """Seconds until deadline (0 if passed)."""
-        if gl.block.timestamp >= self.deadline:
+        """Seconds until deadline (0 if passed or settled)."""
+        if self.status in _TERMINAL:
+            return 0
+        now = gl.block.timestamp
+        if now >= self.deadline:
             return 0
-        return self.deadline - gl.block.timestamp
+        return self.deadline - now
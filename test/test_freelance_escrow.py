@@ -1,5 +1,6 @@
+import pytest
 from gltest import get_contract_factory, default_account, get_account
-from gltest.assertions import tx_execution_succeeded
+from gltest.assertions import tx_execution_succeeded, tx_execution_failed
 
 
 def deploy_escrow():
@@ -37,6 +38,40 @@ def test_job_creation_and_details():
     assert details["evaluation_result"] == ""
 
 
+def test_rejects_oversized_title():
+    """Test that deployment fails when the job title exceeds the limit."""
+    factory = get_contract_factory("FreelanceEscrow")
+
+    with pytest.raises(Exception):
+        factory.deploy(
+            args=["x" * 257, "Create a landing page", 72],
+            value=1000000,
+        )
+
+
+def test_rejects_oversized_requirements():
+    """Test that deployment fails when the requirements exceed the limit."""
+    factory = get_contract_factory("FreelanceEscrow")
+
+    with pytest.raises(Exception):
+        factory.deploy(
+            args=["Build a Landing Page", "x" * 8193, 72],
+            value=1000000,
+        )
+
+
+def test_status_bundle():
+    """Test that the status bundle matches the individual views."""
+    contract = deploy_escrow()
+
+    bundle = contract.get_status_bundle(args=[])
+    details = contract.get_job_details(args=[])
+    assert bundle["status"] == "open"
+    assert bundle["deadline"] == details["deadline"]
+    assert bundle["time_remaining"] > 0
+    assert bundle["deadline_passed"] is False
+
+
 def test_accept_job():
     """Test that a freelancer can accept an open job."""
     contract = deploy_escrow()
@@ -63,6 +98,22 @@ def test_cancel_job():
     assert status == "refunded"
 
 
+def test_settled_job_deadline_views():
+    """Test that a settled job reports no time remaining and no passed deadline."""
+    contract = deploy_escrow()
+
+    result = contract.cancel_job(args=[])
+    assert tx_execution_succeeded(result)
+
+    assert contract.time_remaining(args=[]) == 0
+    assert contract.is_deadline_passed(args=[]) is False
+
+    bundle = contract.get_status_bundle(args=[])
+    assert bundle["status"] == "refunded"
+    assert bundle["time_remaining"] == 0
+    assert bundle["deadline_passed"] is False
+
+
 def test_cannot_double_accept():
     """Test that a second freelancer cannot accept an already-accepted job."""
     contract = deploy_escrow()
@@ -116,6 +167,70 @@ def test_submit_work():
     assert details["submission_url"] == "https://github.com/example/landing-page"
 
 
+def test_submit_work_multi():
+    """Test that a freelancer can submit several deliverable URLs."""
+    contract = deploy_escrow()
+    freelancer = get_account(1)
+
+    contract.accept_job(args=[], account=freelancer)
+
+    result = contract.submit_work_multi(
+        args=[[
+            "https://github.com/example/landing-page",
+            "https://example.github.io/landing-page",
+        ]],
+        account=freelancer,
+    )
+    assert tx_execution_succeeded(result)
+    assert contract.get_status(args=[]) == "submitted"
+
+    details = contract.get_job_details(args=[])
+    assert details["submission_url"] == "https://github.com/example/landing-page"
+    assert details["submission_urls"] == [
+        "https://github.com/example/landing-page",
+        "https://example.github.io/landing-page",
+    ]
+
+
+@pytest.mark.parametrize(
+    "urls",
+    [
+        [],
+        ["https://github.com/example/landing-page", ""],
+        [f"https://example.com/{i}" for i in range(6)],
+        ["https://example.com/a", "https://example.com/a"],
+    ],
+    ids=["empty-list", "empty-url", "too-many-urls", "duplicate-urls"],
+)
+def test_submit_work_multi_rejects_invalid_urls(urls):
+    """Test that submit_work_multi rejects empty, oversized or duplicate URL lists."""
+    contract = deploy_escrow()
+    freelancer = get_account(1)
+
+    contract.accept_job(args=[], account=freelancer)
+
+    result = contract.submit_work_multi(args=[urls], account=freelancer)
+    assert tx_execution_failed(result)
+
+    assert contract.get_status(args=[]) == "in_progress"
+
+
+def test_rejects_oversized_url():
+    """Test that submit_work rejects a URL longer than the limit."""
+    contract = deploy_escrow()
+    freelancer = get_account(1)
+
+    contract.accept_job(args=[], account=freelancer)
+
+    result = contract.submit_work(
+        args=["https://example.com/" + "x" * 2048],
+        account=freelancer,
+    )
+    assert tx_execution_failed(result)
+
+    assert contract.get_status(args=[]) == "in_progress"
+
+
 def test_only_freelancer_can_submit():
     """Test that only the assigned freelancer can submit work."""
     contract = deploy_escrow()